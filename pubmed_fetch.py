@@ -12,20 +12,399 @@ Usage:
 """
 
 import requests
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 import time
 import sys
 import json
 import argparse
 import configparser
+import multiprocessing
 import os
+import sqlite3
+import threading
+
+try:
+    import orjson  # Optional: faster JSON output (uv sync --extra fast)
+except ImportError:
+    orjson = None
+
+# Placeholder for a missing field. Articles parsed in this process share this
+# one object; ones loaded from the cache or parsed in worker processes carry
+# equal copies, so compare with == rather than `is`.
+NA = sys.intern("N/A")
+
+
+def _parse_xml(content, strict=False):
+    """
+    Parse an E-utilities XML response with lxml
+    """
+    # Parsers are not shared between threads, so build one per response.
+    # strict=True raises on any malformed input instead of recovering, for
+    # responses whose results get cached.
+    parser = ET.XMLParser(huge_tree=True, recover=not strict)
+    root = ET.fromstring(content, parser=parser)
+    if root is None:
+        # recover=True swallows errors that leave no usable document at all
+        raise ET.ParseError("No XML elements found in response", 0, 1, 1)
+    return root
+
+
+def _dumps(obj, indent=False):
+    """
+    Encode obj as UTF-8 JSON bytes, using orjson when it is installed
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=asdict).encode('utf-8')
+
+
+@dataclass(slots=True)
+class Article:
+    """
+    A parsed PubMed article
+    """
+    pmid: str
+    title: str
+    authors: list[str]
+    authors_display: str
+    journal: str
+    date: str
+    abstract: str
+    mesh_terms: list[str]
+    doi: str
+    pmc_id: str
+    url: str
+    fulltext: dict | None = None
+
+
+# XPath expressions used by parse_article, compiled once for every article.
+# Each path is anchored at the field's fixed position in the efetch schema
+# rather than searching the whole record, so large subtrees such as
+# PubmedData/ReferenceList are never walked (and a cited reference's DOI
+# can't be mistaken for the article's own). smart_strings=False returns
+# plain str results that don't pin the tree.
+_XP_PMID = ET.XPath('string(MedlineCitation/PMID)', smart_strings=False)
+_XP_TITLE = ET.XPath('MedlineCitation/Article/ArticleTitle')
+_XP_JOURNAL = ET.XPath('MedlineCitation/Article/Journal/Title')
+_XP_PUB_DATE = ET.XPath('MedlineCitation/Article/Journal/JournalIssue/PubDate')
+_XP_ABSTRACT = ET.XPath('MedlineCitation/Article/Abstract/AbstractText')
+_XP_AUTHORS = ET.XPath('MedlineCitation/Article/AuthorList/Author')
+_XP_MESH_TERMS = ET.XPath(
+    'MedlineCitation/MeshHeadingList/MeshHeading/DescriptorName/text()', smart_strings=False
+)
+_XP_ARTICLE_IDS = ET.XPath('PubmedData/ArticleIdList/ArticleId')
+
+
+def parse_article(article_xml):
+    """
+    Parse individual article XML to extract relevant information
+    """
+    try:
+        # Extract PMID
+        pmid = _XP_PMID(article_xml) or NA
+
+        title_elem = _XP_TITLE(article_xml)
+        journal_elem = _XP_JOURNAL(article_xml)
+        pub_date = _XP_PUB_DATE(article_xml)
+        abstract_elements = _XP_ABSTRACT(article_xml)
+
+        # Extract title
+        title = title_elem[0].text if title_elem else NA
+
+        # Extract authors
+        authors = []
+        for author in _XP_AUTHORS(article_xml):
+            # Collective authors have no LastName and are skipped
+            lastname = author.findtext('LastName')
+            if lastname is not None:
+                forename = author.findtext('ForeName')
+                authors.append(lastname if forename is None else f"{lastname}, {forename}")
+
+        author_str = "; ".join(authors[:5])  # Limit to first 5 authors
+        if len(authors) > 5:
+            author_str += " et al."
+
+        # Extract journal
+        journal = journal_elem[0].text if journal_elem else NA
+
+        # Extract publication date
+        date_str = NA
+        if pub_date:
+            pub_date = pub_date[0]
+            year = pub_date.find('Year')
+            month = pub_date.find('Month')
+            day = pub_date.find('Day')
+
+            if year is not None:
+                date_str = year.text
+                if month is not None:
+                    date_str += f"-{month.text}"
+                    if day is not None:
+                        date_str += f"-{day.text}"
+
+        # Extract full abstract
+        abstract = ""
+        if abstract_elements:
+            abstract_parts = []
+            for elem in abstract_elements:
+                # Handle structured abstracts with labels
+                label = elem.get('Label', '')
+                text = elem.text or ''
+                if label:
+                    abstract_parts.append(f"{label}: {text}")
+                else:
+                    abstract_parts.append(text)
+            abstract = " ".join(abstract_parts).strip()
+
+        # Extract MeSH terms
+        mesh_terms = _XP_MESH_TERMS(article_xml)
+
+        # Extract DOI and PMC ID if available (first of each, one scan)
+        doi = ""
+        pmc_id = ""
+        for article_id in _XP_ARTICLE_IDS(article_xml):
+            id_type = article_id.get('IdType')
+            if id_type == 'doi' and not doi:
+                doi = article_id.text
+            elif id_type == 'pmc' and not pmc_id:
+                pmc_id = article_id.text
+            if doi and pmc_id:
+                break
+
+        return Article(
+            pmid=pmid,
+            title=title,
+            authors=authors,  # Full list; authors_display is the truncated version
+            authors_display=author_str,
+            journal=journal,
+            date=date_str,
+            abstract=abstract,
+            mesh_terms=mesh_terms,
+            doi=doi,
+            pmc_id=pmc_id,
+            url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+        )
+
+    except Exception as e:
+        print(f"Error parsing article: {e}")
+        return None
+
+
+def _new_article_parser():
+    """
+    Create a pull parser that reports each completed PubmedArticle element
+    """
+    # Strict, unlike _parse_xml: a truncated or malformed body must fail the
+    # batch rather than yield partial records that would then be cached
+    return ET.XMLPullParser(events=('end',), tag='PubmedArticle', huge_tree=True)
+
+
+def _read_articles(parser, articles):
+    """
+    Parse the articles completed so far and release their elements
+    """
+    for _, article in parser.read_events():
+        article_info = parse_article(article)
+        if article_info:
+            articles.append(article_info)
+
+        # Drop the finished article and any siblings already handled
+        article.clear(keep_tail=True)
+        while article.getprevious() is not None:
+            del article.getparent()[0]
+
+
+def parse_articles(content, chunk_size=64 * 1024):
+    """
+    Parse an efetch response body into a list of article dicts
+    """
+    # Feed in chunks so only about one article's elements are alive at a time
+    parser = _new_article_parser()
+    articles = []
+    for i in range(0, len(content), chunk_size):
+        parser.feed(content[i:i + chunk_size])
+        _read_articles(parser, articles)
+    parser.close()
+    _read_articles(parser, articles)
+    return articles
+
+
+def _parse_articles_in_worker(content):
+    """
+    parse_articles entry point for worker processes
+    """
+    try:
+        return parse_articles(content)
+    except ET.ParseError as e:
+        # lxml parse errors can't be pickled back to the parent process
+        raise ValueError(str(e)) from None
+
+
+def _strip_pmc_prefix(pmc_id):
+    """
+    Return a PMC ID without its 'PMC' prefix
+    """
+    return pmc_id[3:] if pmc_id.startswith('PMC') else pmc_id
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls to at most `rate` per second
+
+    Each wait() reserves the next free slot, so concurrent workers share one
+    request budget instead of each sleeping a fixed amount.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _RateLimitedRetry(Retry):
+    """
+    urllib3 Retry that also takes a RateLimiter slot before each retry
+
+    urllib3 resends inside session.get/post, where the caller's wait() has
+    already been spent, and its first backoff is always 0s. Without this a
+    429 or 5xx would be retried immediately by every worker at once.
+    """
+
+    def __init__(self, *args, rate_limiter=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+
+    def new(self, **kw):
+        # urllib3 builds a fresh Retry per attempt; carry the limiter over
+        kw.setdefault('rate_limiter', self.rate_limiter)
+        return super().new(**kw)
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait()
+
+
+class ArticleCache:
+    """
+    SQLite-backed on-disk cache for PubMed articles and PMC OA status
+
+    Published PubMed records are effectively immutable, so repeated or
+    overlapping searches can reuse earlier results instead of refetching.
+    """
+
+    def __init__(self, directory, expire_days=30):
+        os.makedirs(directory, exist_ok=True)
+        self.expire_seconds = expire_days * 86400
+        self.conn = sqlite3.connect(os.path.join(directory, "cache.sqlite3"))
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def get_many(self, namespace, ids):
+        """
+        Return a dict of id -> cached value for the ids that are present and unexpired
+        """
+        found = {}
+        now = time.time()
+        ids = list(ids)
+        # Query in chunks to stay under SQLite's bound-parameter limit
+        for i in range(0, len(ids), 500):
+            keys = [f"{namespace}:{id_}" for id_ in ids[i:i + 500]]
+            placeholders = ",".join("?" * len(keys))
+            rows = self.conn.execute(
+                f"SELECT key, value FROM cache WHERE expires > ? AND key IN ({placeholders})", (now, *keys)
+            )
+            for key, value in rows:
+                try:
+                    found[key[len(namespace) + 1:]] = json.loads(value)
+                except ValueError:
+                    # A corrupt row counts as a miss and is replaced on the next store
+                    continue
+        return found
+
+    def set_many(self, namespace, items):
+        """
+        Store (id, value) pairs under the given namespace
+        """
+        expires = time.time() + self.expire_seconds
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                ((f"{namespace}:{id_}", json.dumps(value), expires) for id_, value in items),
+            )
+
+    def close(self):
+        """
+        Close the underlying SQLite connection
+        """
+        self.conn.close()
+
 
 class PubMedSearcher:
-    def __init__(self):
+    def __init__(self, api_key=None):
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+        self.oa_url = "https://www.ncbi.nlm.nih.gov/pmc/utils/oa/oa.fcgi"
         self.tool = "gynecologic_neoplasms_search_script"
         self.email = "user@example.com"  # Replace with your email
+        self.api_key = api_key
+
+        # NCBI allows 10 requests/second with an API key and 3 without.
+        # All E-utilities requests draw from one limiter; max_workers only
+        # sets how many batch requests can be in flight while waiting on the
+        # network. The PMC OA service isn't sent the key, so it stays at the
+        # keyless rate, sharing the one limiter when there is no key.
+        requests_per_second = 10 if api_key else 3
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.oa_rate_limiter = RateLimiter(3) if api_key else self.rate_limiter
+        self.max_workers = requests_per_second
+
+        # Worker processes used to parse efetch batches; 0 parses in the
+        # fetching threads instead, which is cheaper for small result sets
+        self.parse_workers = 0
+
+        # Reuse keep-alive connections across requests; retry transient
+        # failures with exponential backoff (honoring Retry-After on 429/503),
+        # each retry also paced by the limiter of the service it goes to.
+        # POST is included because efetch requests are read-only.
+        self.session = requests.Session()
+        for url, limiter in ((self.base_url, self.rate_limiter), (self.oa_url, self.oa_rate_limiter)):
+            retries = _RateLimitedRetry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+                rate_limiter=limiter,
+            )
+            self.session.mount(url, HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries))
+        self.session.headers['User-Agent'] = f"{self.tool} ({requests.utils.default_user_agent()})"
+
+        # Optional ArticleCache; when set, previously fetched PMIDs are reused
+        self.cache = None
+
+        # Canonical copies of strings that repeat across articles
+        self._str_pool = {}
+
+        # Date window of the last search, reused when saving results
+        self._search_start = None
+        self._search_end = None
 
     def search_pubmed(self, mesh_terms=None, authors=None, organizations=None, days_back=30, max_results=1000):
         """
@@ -38,6 +417,8 @@ class PubMedSearcher:
         # Calculate date range
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
+        self._search_start = start_date
+        self._search_end = end_date
 
         # Format dates for PubMed API (YYYY/MM/DD)
         start_date_str = start_date.strftime("%Y/%m/%d")
@@ -78,6 +459,8 @@ class PubMedSearcher:
             'tool': self.tool,
             'email': self.email
         }
+        if self.api_key:
+            search_params['api_key'] = self.api_key
 
         display_parts = []
         if mesh_terms:
@@ -94,15 +477,16 @@ class PubMedSearcher:
         try:
             # Perform search
             search_url = f"{self.base_url}esearch.fcgi"
-            response = requests.get(search_url, params=search_params)
+            self.rate_limiter.wait()
+            response = self.session.get(search_url, params=search_params)
             response.raise_for_status()
 
             # Parse XML response
-            root = ET.fromstring(response.content)
+            root = _parse_xml(response.content)
 
             # Extract PMIDs
             pmids = []
-            for id_elem in root.findall('.//Id'):
+            for id_elem in root.iterfind('.//Id'):
                 pmids.append(id_elem.text)
 
             # Get count
@@ -132,155 +516,122 @@ class PubMedSearcher:
 
         print(f"Fetching details for {len(pmids)} articles...")
 
-        all_articles = []
-        batch_size = 200  # Process in smaller batches
-
-        for i in range(0, len(pmids), batch_size):
-            batch_pmids = pmids[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (len(pmids) + batch_size - 1) // batch_size
-
-            print(f"Processing batch {batch_num}/{total_batches} ({len(batch_pmids)} articles)...")
-
-            # E-fetch parameters
-            fetch_params = {
-                'db': 'pubmed',
-                'id': ','.join(batch_pmids),
-                'retmode': 'xml',
-                'tool': self.tool,
-                'email': self.email
-            }
-
-            try:
-                # Add delay to be respectful to NCBI servers
-                time.sleep(1)
-
-                fetch_url = f"{self.base_url}efetch.fcgi"
-                response = requests.get(fetch_url, params=fetch_params)
-                response.raise_for_status()
+        # Only request PMIDs that aren't already cached
+        cached = {}
+        if self.cache:
+            for pmid, fields in self.cache.get_many("pubmed", pmids).items():
+                try:
+                    cached[pmid] = Article(**fields)
+                except TypeError:
+                    # Rows that don't fit the current Article fields are refetched
+                    continue
+        if cached:
+            print(f"Using cached details for {len(cached)} articles")
+        missing = [pmid for pmid in pmids if pmid not in cached]
 
-                # Parse XML response
-                root = ET.fromstring(response.content)
-
-                batch_articles = []
-                for article in root.findall('.//PubmedArticle'):
-                    article_info = self.parse_article(article)
-                    if article_info:
-                        batch_articles.append(article_info)
-
-                all_articles.extend(batch_articles)
-                print(f"Retrieved {len(batch_articles)} articles from batch {batch_num}")
-
-            except requests.RequestException as e:
-                print(f"Error fetching batch {batch_num}: {e}")
-                continue
-            except ET.ParseError as e:
-                print(f"Error parsing batch {batch_num}: {e}")
-                continue
+        all_articles = []
+        batch_size = 500  # IDs go in a POST body, so batches aren't bound by URL length
+        batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+        total_batches = len(batches)
+
+        # Batches are independent, so overlap their network round trips.
+        # Worker processes are spawned rather than forked from this threaded process.
+        parse_pool = None
+        if self.parse_workers:
+            parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        with parse_pool or nullcontext(), ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._fetch_batch, batch_pmids, batch_num, total_batches, parse_pool)
+                for batch_num, batch_pmids in enumerate(batches, 1)
+            ]
+            # Collect in submission order so results keep the PMID order
+            for future in futures:
+                all_articles.extend(future.result())
+
+        if self.cache:
+            self.cache.set_many("pubmed", ((a.pmid, asdict(a)) for a in all_articles if a.pmid != NA))
+
+        if cached:
+            # Merge cached and fetched articles back into the search order
+            fetched = {article.pmid: article for article in all_articles}
+            merged = []
+            for pmid in pmids:
+                if pmid in cached:
+                    merged.append(cached[pmid])
+                elif pmid in fetched:
+                    merged.append(fetched.pop(pmid))
+            # Keep any records NCBI returned under a different PMID
+            all_articles = merged + list(fetched.values())
+
+        self._share_common_strings(all_articles)
 
         print(f"Total articles retrieved: {len(all_articles)}")
         return all_articles
 
-    def parse_article(self, article_xml):
+    def _share_common_strings(self, articles):
+        """
+        Make repeated journal names and MeSH terms share one str object each
+        """
+        # Journals and MeSH descriptors come from small vocabularies, so most
+        # entries are duplicates of strings already seen in earlier articles
+        _intern = self._str_pool.setdefault
+        for article in articles:
+            article.journal = _intern(article.journal, article.journal)
+            article.mesh_terms = [_intern(term, term) for term in article.mesh_terms]
+
+    def _fetch_batch(self, batch_pmids, batch_num, total_batches, parse_pool=None):
         """
-        Parse individual article XML to extract relevant information
+        Fetch and parse a single batch of PMIDs
         """
+        print(f"Processing batch {batch_num}/{total_batches} ({len(batch_pmids)} articles)...")
+
+        # E-fetch parameters
+        fetch_params = {
+            'db': 'pubmed',
+            'id': ','.join(batch_pmids),
+            'retmode': 'xml',
+            'tool': self.tool,
+            'email': self.email
+        }
+        if self.api_key:
+            fetch_params['api_key'] = self.api_key
+
         try:
-            # Extract PMID
-            pmid_elem = article_xml.find('.//PMID')
-            pmid = pmid_elem.text if pmid_elem is not None else "N/A"
-
-            # Extract title
-            title_elem = article_xml.find('.//ArticleTitle')
-            title = title_elem.text if title_elem is not None else "N/A"
-
-            # Extract authors
-            authors = []
-            for author in article_xml.findall('.//Author'):
-                lastname = author.find('LastName')
-                forename = author.find('ForeName')
-                if lastname is not None and forename is not None:
-                    authors.append(f"{lastname.text}, {forename.text}")
-                elif lastname is not None:
-                    authors.append(lastname.text)
-
-            author_str = "; ".join(authors[:5])  # Limit to first 5 authors
-            if len(authors) > 5:
-                author_str += " et al."
-
-            # Extract journal
-            journal_elem = article_xml.find('.//Journal/Title')
-            journal = journal_elem.text if journal_elem is not None else "N/A"
-
-            # Extract publication date
-            pub_date = article_xml.find('.//PubDate')
-            date_str = "N/A"
-            if pub_date is not None:
-                year = pub_date.find('Year')
-                month = pub_date.find('Month')
-                day = pub_date.find('Day')
-
-                if year is not None:
-                    date_str = year.text
-                    if month is not None:
-                        date_str += f"-{month.text}"
-                        if day is not None:
-                            date_str += f"-{day.text}"
-
-            # Extract full abstract
-            abstract_elements = article_xml.findall('.//Abstract/AbstractText')
-            abstract = ""
-            if abstract_elements:
-                abstract_parts = []
-                for elem in abstract_elements:
-                    # Handle structured abstracts with labels
-                    label = elem.get('Label', '')
-                    text = elem.text or ''
-                    if label:
-                        abstract_parts.append(f"{label}: {text}")
-                    else:
-                        abstract_parts.append(text)
-                abstract = " ".join(abstract_parts).strip()
-
-            # Extract MeSH terms
-            mesh_terms = []
-            for mesh_heading in article_xml.findall('.//MeshHeading'):
-                descriptor = mesh_heading.find('DescriptorName')
-                if descriptor is not None:
-                    mesh_terms.append(descriptor.text)
-
-            # Extract DOI if available
-            doi = ""
-            for article_id in article_xml.findall('.//ArticleId'):
-                if article_id.get('IdType') == 'doi':
-                    doi = article_id.text
-                    break
-
-            # Extract PMC ID if available
-            pmc_id = ""
-            for article_id in article_xml.findall('.//ArticleId'):
-                if article_id.get('IdType') == 'pmc':
-                    pmc_id = article_id.text
-                    break
-
-            return {
-                'pmid': pmid,
-                'title': title,
-                'authors': authors,  # Return full list instead of truncated string
-                'authors_display': author_str,  # Keep display version
-                'journal': journal,
-                'date': date_str,
-                'abstract': abstract,
-                'mesh_terms': mesh_terms,
-                'doi': doi,
-                'pmc_id': pmc_id,
-                'url': f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
-                'fulltext': None
-            }
+            self.rate_limiter.wait()
 
-        except Exception as e:
-            print(f"Error parsing article: {e}")
-            return None
+            fetch_url = f"{self.base_url}efetch.fcgi"
+            with self.session.post(fetch_url, data=fetch_params, stream=True) as response:
+                response.raise_for_status()
+
+                if parse_pool is not None:
+                    # Parse in a worker process, in parallel with other batches
+                    try:
+                        batch_articles = parse_pool.submit(_parse_articles_in_worker, response.content).result()
+                    except BrokenProcessPool:
+                        # A worker died; parse this batch here rather than lose it
+                        print(f"Parse worker failed for batch {batch_num}, parsing in-process")
+                        batch_articles = parse_articles(response.content)
+                else:
+                    # Parse the response as it streams in, one article at a time
+                    parser = _new_article_parser()
+                    batch_articles = []
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        parser.feed(chunk)
+                        _read_articles(parser, batch_articles)
+                    parser.close()
+                    _read_articles(parser, batch_articles)
+
+            print(f"Retrieved {len(batch_articles)} articles from batch {batch_num}")
+            return batch_articles
+
+        except requests.RequestException as e:
+            print(f"Error fetching batch {batch_num}: {e}")
+            return []
+        except (ET.ParseError, ValueError) as e:
+            print(f"Error parsing batch {batch_num}: {e}")
+            return []
 
     def add_fulltext_info(self, articles):
         """
@@ -293,21 +644,21 @@ class PubMedSearcher:
 
         # Initialize fulltext info for all articles
         for article in articles:
-            article['fulltext'] = None
+            article.fulltext = None
 
         # Handle articles with PMC IDs
-        articles_with_pmc = [article for article in articles if article.get('pmc_id')]
+        articles_with_pmc = [article for article in articles if article.pmc_id]
 
         if articles_with_pmc:
             # Add PMC links for articles with PMC IDs
             for article in articles_with_pmc:
-                pmc_id = article['pmc_id']
+                pmc_id = article.pmc_id
 
                 # Ensure PMC ID has proper format
                 if not pmc_id.startswith('PMC'):
                     pmc_id = f"PMC{pmc_id}"
 
-                article['fulltext'] = {
+                article.fulltext = {
                     'url': f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmc_id}/",
                     'source': 'PMC',
                     'access_type': 'unknown'  # Will be updated if we can determine
@@ -319,11 +670,11 @@ class PubMedSearcher:
         # Check for other full-text sources (publisher websites, etc.)
         self._check_other_fulltext_sources(articles)
 
-        fulltext_count = sum(1 for article in articles if article.get('fulltext'))
+        fulltext_count = sum(1 for article in articles if article.fulltext)
         open_access_count = sum(
             1
             for article in articles
-            if article.get('fulltext') and article['fulltext'].get('access_type') == 'open'
+            if article.fulltext and article.fulltext.get('access_type') == 'open'
         )
 
         print(
@@ -337,78 +688,92 @@ class PubMedSearcher:
         """
         Check PMC Open Access status for articles with PMC IDs
         """
+        # Reuse OA status from earlier runs where available
+        if self.cache:
+            cached = self.cache.get_many("pmc-oa", (article.pmc_id for article in articles_with_pmc))
+            for article in articles_with_pmc:
+                if article.pmc_id in cached:
+                    article.fulltext.update(cached[article.pmc_id])
+            articles_with_pmc = [article for article in articles_with_pmc if article.pmc_id not in cached]
+
         batch_size = 50
-        for i in range(0, len(articles_with_pmc), batch_size):
-            batch = articles_with_pmc[i:i + batch_size]
-            pmc_ids = [article['pmc_id'] for article in batch]
-
-            try:
-                # Format PMC IDs for OA service
-                formatted_ids = []
-                for pmc_id in pmc_ids:
-                    if pmc_id.startswith('PMC'):
-                        formatted_ids.append(pmc_id[3:])
-                    else:
-                        formatted_ids.append(pmc_id)
-
-                oa_url = "https://www.ncbi.nlm.nih.gov/pmc/utils/oa/oa.fcgi"
-                params = {
-                    'id': ','.join(formatted_ids),
-                    'tool': self.tool,
-                    'email': self.email
-                }
+        batches = [articles_with_pmc[i:i + batch_size] for i in range(0, len(articles_with_pmc), batch_size)]
+
+        # Each batch only updates its own articles, so the requests can overlap
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(self._check_pmc_batch, batches))
+
+        if self.cache:
+            # Failed checks stay 'unknown' and are retried next run
+            oa_fields = ('access_type', 'license', 'download_links')
+            self.cache.set_many("pmc-oa", (
+                (article.pmc_id, {k: article.fulltext[k] for k in oa_fields if k in article.fulltext})
+                for article in articles_with_pmc
+                if article.fulltext['access_type'] != 'unknown'
+            ))
+
+    def _check_pmc_batch(self, batch):
+        """
+        Check PMC Open Access status for a single batch of articles
+        """
+        try:
+            # Index the batch by bare numeric PMC ID, the form the OA service takes
+            by_pmc = {_strip_pmc_prefix(article.pmc_id): article for article in batch}
 
-                time.sleep(0.5)  # Be respectful to the API
-                response = requests.get(oa_url, params=params)
-                response.raise_for_status()
+            params = {
+                'id': ','.join(by_pmc),
+                'tool': self.tool,
+                'email': self.email
+            }
+
+            self.oa_rate_limiter.wait()
+            response = self.session.get(self.oa_url, params=params)
+            response.raise_for_status()
 
-                # Parse XML response
-                root = ET.fromstring(response.content)
-
-                # Check for Open Access records
-                for record in root.findall('.//record'):
-                    pmc_id_elem = record.get('id')
-                    if not pmc_id_elem:
-                        continue
-
-                    # Find corresponding article
-                    for article in batch:
-                        article_pmc_id = article['pmc_id']
-                        if article_pmc_id.startswith('PMC'):
-                            article_pmc_id = article_pmc_id[3:]
-
-                        if article_pmc_id == pmc_id_elem:
-                            # Extract license and download links
-                            license_type = record.get('license', 'unknown')
-
-                            download_links = []
-                            for link in record.findall('.//link'):
-                                link_format = link.get('format', '')
-                                link_url = link.get('href', '')
-                                if link_url:
-                                    download_links.append({
-                                        'format': link_format,
-                                        'url': link_url
-                                    })
-
-                            # Update fulltext info
-                            article['fulltext']['access_type'] = 'open'
-                            article['fulltext']['license'] = license_type
-                            if download_links:
-                                article['fulltext']['download_links'] = download_links
-                            break
-
-                # Mark remaining PMC articles as closed access
-                for article in batch:
-                    if article['fulltext']['access_type'] == 'unknown':
-                        article['fulltext']['access_type'] = 'closed'
-
-            except Exception:
-                # If we can't check, leave as unknown
-                for article in batch:
-                    if article['fulltext']['access_type'] == 'unknown':
-                        article['fulltext']['access_type'] = 'unknown'
-                continue
+            # Parse XML response; strictly, so a truncated body leaves the
+            # batch unknown instead of caching its missing records as closed
+            root = _parse_xml(response.content, strict=True)
+
+            # Check for Open Access records
+            for record in root.iterfind('.//record'):
+                pmc_id_elem = record.get('id')
+                if not pmc_id_elem:
+                    continue
+
+                # Find corresponding article (records may carry the PMC prefix)
+                article = by_pmc.get(_strip_pmc_prefix(pmc_id_elem))
+                if article is None:
+                    continue
+
+                # Extract license and download links
+                license_type = record.get('license', 'unknown')
+
+                download_links = []
+                for link in record.iterfind('.//link'):
+                    link_format = link.get('format', '')
+                    link_url = link.get('href', '')
+                    if link_url:
+                        download_links.append({
+                            'format': link_format,
+                            'url': link_url
+                        })
+
+                # Update fulltext info
+                article.fulltext['access_type'] = 'open'
+                article.fulltext['license'] = license_type
+                if download_links:
+                    article.fulltext['download_links'] = download_links
+
+            # Mark remaining PMC articles as closed access
+            for article in batch:
+                if article.fulltext['access_type'] == 'unknown':
+                    article.fulltext['access_type'] = 'closed'
+
+        except Exception:
+            # If we can't check, leave as unknown
+            for article in batch:
+                if article.fulltext['access_type'] == 'unknown':
+                    article.fulltext['access_type'] = 'unknown'
 
     def _check_other_fulltext_sources(self, articles):
         """
@@ -416,10 +781,10 @@ class PubMedSearcher:
         """
         # For articles without PMC IDs, check if DOI links to open access
         for article in articles:
-            if not article.get('fulltext') and article.get('doi'):
+            if not article.fulltext and article.doi:
                 # Create a DOI link - many are open access
-                doi_url = f"https://doi.org/{article['doi']}"
-                article['fulltext'] = {
+                doi_url = f"https://doi.org/{article.doi}"
+                article.fulltext = {
                     'url': doi_url,
                     'source': 'Publisher (via DOI)',
                     'access_type': 'unknown'  # Would need additional API calls to determine
@@ -442,33 +807,33 @@ class PubMedSearcher:
         print("=" * 80)
 
         for i, article in enumerate(articles, 1):
-            print(f"\n{i}. {article['title']}")
-            print(f"   Authors: {article['authors_display']}")
-            print(f"   Journal: {article['journal']}")
-            print(f"   Date: {article['date']}")
-            print(f"   PMID: {article['pmid']}")
-            print(f"   URL: {article['url']}")
-            if article['mesh_terms']:
-                mesh_list = ", ".join(article['mesh_terms'][:5])
-                suffix = "..." if len(article['mesh_terms']) > 5 else ""
+            print(f"\n{i}. {article.title}")
+            print(f"   Authors: {article.authors_display}")
+            print(f"   Journal: {article.journal}")
+            print(f"   Date: {article.date}")
+            print(f"   PMID: {article.pmid}")
+            print(f"   URL: {article.url}")
+            if article.mesh_terms:
+                mesh_list = ", ".join(article.mesh_terms[:5])
+                suffix = "..." if len(article.mesh_terms) > 5 else ""
                 print(f"   MeSH Terms: {mesh_list}{suffix}")
-            if article['abstract']:
-                is_long = len(article['abstract']) > 200
-                abstract_preview = article['abstract'][:200] + "..." if is_long else article['abstract']
+            if article.abstract:
+                is_long = len(article.abstract) > 200
+                abstract_preview = article.abstract[:200] + "..." if is_long else article.abstract
                 print(f"   Abstract: {abstract_preview}")
-            if article.get('pmc_id'):
-                print(f"   PMC ID: {article['pmc_id']}")
-            if article.get('fulltext'):
+            if article.pmc_id:
+                print(f"   PMC ID: {article.pmc_id}")
+            if article.fulltext:
                 access_indicator = ""
-                if article['fulltext']['access_type'] == 'open':
+                if article.fulltext['access_type'] == 'open':
                     access_indicator = " [Open Access]"
-                elif article['fulltext']['access_type'] == 'closed':
+                elif article.fulltext['access_type'] == 'closed':
                     access_indicator = " [Closed Access]"
 
-                print(f"   Full-text: {article['fulltext']['url']}{access_indicator}")
+                print(f"   Full-text: {article.fulltext['url']}{access_indicator}")
 
-                if 'download_links' in article['fulltext']:
-                    formats = [link['format'] for link in article['fulltext']['download_links']]
+                if 'download_links' in article.fulltext:
+                    formats = [link['format'] for link in article.fulltext['download_links']]
                     print(f"   Downloads: {', '.join(formats)} available")
             print("-" * 40)
 
@@ -479,21 +844,38 @@ class PubMedSearcher:
         try:
             mesh_display = mesh_terms if isinstance(mesh_terms, list) else [mesh_terms]
 
-            data = {
-                "search_info": {
-                    "mesh_terms": mesh_display,
-                    "generated_on": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    "date_range": {
-                        "start_date": (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d'),
-                        "end_date": datetime.now().strftime('%Y-%m-%d')
-                    },
-                    "total_articles": len(articles)
+            # Report the window the search actually used, falling back to
+            # days_back from a single timestamp if no search has run
+            now = datetime.now()
+            end_date = self._search_end or now
+            start_date = self._search_start or end_date - timedelta(days=days_back)
+
+            search_info = {
+                "mesh_terms": mesh_display,
+                "generated_on": now.strftime('%Y-%m-%d %H:%M:%S'),
+                "date_range": {
+                    "start_date": start_date.strftime('%Y-%m-%d'),
+                    "end_date": end_date.strftime('%Y-%m-%d')
                 },
-                "articles": articles
+                "total_articles": len(articles)
             }
 
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Encode one article at a time so the whole document never
+            # has to be held in memory as a single string
+            with open(filename, 'wb') as f:
+                if filename.endswith('.jsonl'):
+                    # JSON Lines: search_info first, then one article per line
+                    f.write(_dumps({"search_info": search_info}) + b"\n")
+                    for article in articles:
+                        f.write(_dumps(article) + b"\n")
+                else:
+                    # Same layout as json.dump(..., indent=2) of the full document
+                    f.write(b'{\n  "search_info": ' + _dumps(search_info, indent=True).replace(b"\n", b"\n  "))
+                    f.write(b',\n  "articles": [')
+                    for i, article in enumerate(articles):
+                        f.write(b",\n    " if i else b"\n    ")
+                        f.write(_dumps(article, indent=True).replace(b"\n", b"\n    "))
+                    f.write(b"\n  ]\n}" if articles else b"]\n}")
 
             print(f"\nResults saved to: {filename}")
 
@@ -515,7 +897,10 @@ def load_config(config_file):
         'days': 30,
         'max_results': 1000,
         'output_file': 'pubmed_articles.json',
-        'email': 'user@example.com'
+        'email': 'user@example.com',
+        'api_key': None,
+        'cache_dir': None,
+        'parse_workers': 0
     }
 
     if 'search' in config:
@@ -547,8 +932,30 @@ def load_config(config_file):
         if 'email' in section:
             search_config['email'] = section['email']
 
+        if 'api_key' in section:
+            search_config['api_key'] = section['api_key']
+
+        if 'cache_dir' in section:
+            search_config['cache_dir'] = section['cache_dir']
+
+        if 'parse_workers' in section:
+            parse_workers = section.getint('parse_workers')
+            if parse_workers < 0:
+                raise ValueError(f"parse_workers must be 0 or more, got {parse_workers}")
+            search_config['parse_workers'] = parse_workers
+
     return search_config
 
+def _non_negative_int(value):
+    """
+    argparse type for counts where 0 is allowed
+    """
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {value}")
+    return number
+
+
 def parse_arguments():
     """
     Parse command-line arguments
@@ -601,7 +1008,7 @@ Examples:
 
     parser.add_argument(
         '--output',
-        help='Output JSON filename (default: pubmed_articles.json)'
+        help='Output JSON filename; use a .jsonl extension for JSON Lines (default: pubmed_articles.json)'
     )
 
     parser.add_argument(
@@ -609,6 +1016,23 @@ Examples:
         help='Your email address for NCBI API (recommended)'
     )
 
+    parser.add_argument(
+        '--api-key',
+        help='NCBI API key; raises the request rate limit from 3 to 10 per second (default: $NCBI_API_KEY)'
+    )
+
+    parser.add_argument(
+        '--parse-workers',
+        type=_non_negative_int,
+        default=0,
+        help='Parse fetched batches in this many worker processes (default: 0, parse in-process)'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        help='Directory for an on-disk cache of fetched articles, e.g. ~/.cache/pubmed_fetch (default: no cache)'
+    )
+
     parser.add_argument(
         '--config',
         help='Configuration file (INI format)'
@@ -647,6 +1071,15 @@ output_file = pubmed_articles.json
 
 # Your email address (recommended for NCBI API)
 email = user@example.com
+
+# NCBI API key (optional; allows 10 requests/second instead of 3)
+#api_key = your_ncbi_api_key
+
+# Cache fetched articles on disk and reuse them across runs (optional)
+#cache_dir = ~/.cache/pubmed_fetch
+
+# Parse fetched batches in this many worker processes (0 parses in-process)
+#parse_workers = 4
 """
 
     try:
@@ -677,7 +1110,11 @@ def main():
         if not os.path.exists(args.config):
             print(f"Error: Configuration file '{args.config}' not found.")
             sys.exit(1)
-        config = load_config(args.config)
+        try:
+            config = load_config(args.config)
+        except ValueError as e:
+            print(f"Error: Invalid configuration file '{args.config}': {e}")
+            sys.exit(1)
 
     # Override config with command-line arguments
     mesh_terms = args.mesh_terms or config.get('mesh_terms', [])
@@ -687,6 +1124,9 @@ def main():
     max_results = args.max_results if args.max_results != 1000 else config.get('max_results', 1000)
     output_file = args.output or config.get('output_file', 'pubmed_articles.json')
     email = args.email or config.get('email', 'user@example.com')
+    api_key = args.api_key or config.get('api_key') or os.environ.get('NCBI_API_KEY')
+    cache_dir = args.cache_dir or config.get('cache_dir')
+    parse_workers = args.parse_workers or config.get('parse_workers', 0)
 
     # Validate inputs: require at least one filtering dimension
     if not (mesh_terms or authors or organizations):
@@ -697,22 +1137,29 @@ def main():
         print("Use --help for usage information or --create-config to create a sample config file.")
         sys.exit(1)
 
-    # Initialize searcher with email
-    searcher = PubMedSearcher()
+    # Initialize searcher with email and API key
+    searcher = PubMedSearcher(api_key=api_key)
     searcher.email = email
+    searcher.parse_workers = parse_workers
+    if cache_dir:
+        searcher.cache = ArticleCache(os.path.expanduser(cache_dir))
 
-    # Search for articles
-    articles = searcher.search_pubmed(
-        mesh_terms=mesh_terms,
-        authors=authors,
-        organizations=organizations,
-        days_back=days,
-        max_results=max_results,
-    )
+    try:
+        # Search for articles
+        articles = searcher.search_pubmed(
+            mesh_terms=mesh_terms,
+            authors=authors,
+            organizations=organizations,
+            days_back=days,
+            max_results=max_results,
+        )
 
-    # Always check for full-text availability
-    if articles:
-        articles = searcher.add_fulltext_info(articles)
+        # Always check for full-text availability
+        if articles:
+            articles = searcher.add_fulltext_info(articles)
+    finally:
+        if searcher.cache:
+            searcher.cache.close()
 
     # Display results
     # For display, prefer MeSH terms if present, else authors/organizations
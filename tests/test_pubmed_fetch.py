@@ -1,3 +1,7 @@
+import json
+
+import pytest
+
 import pubmed_fetch as pf
 
 
@@ -19,7 +23,7 @@ def test_parse_arguments_mesh_and_author(monkeypatch):
 
 
 def test_build_query_and_params(monkeypatch):
-    # Build a searcher and intercept requests.get to capture params
+    # Build a searcher and intercept its session's get to capture params
     captured = {}
 
     def fake_get(url, params=None, **kwargs):
@@ -36,10 +40,9 @@ def test_build_query_and_params(monkeypatch):
                 </eSearchResult>"""
         return R()
 
-    monkeypatch.setattr(pf.requests, "get", fake_get)
-
     searcher = pf.PubMedSearcher()
     searcher.email = "you@example.com"
+    monkeypatch.setattr(searcher.session, "get", fake_get)
 
     # Compose a query using multiple categories
     searcher.search_pubmed(
@@ -62,3 +65,379 @@ def test_build_query_and_params(monkeypatch):
     assert captured["params"]["tool"] == searcher.tool
     assert captured["params"]["email"] == searcher.email
 
+
+
+def test_session_retries_transient_errors():
+    searcher = pf.PubMedSearcher()
+    adapter = searcher.session.get_adapter(searcher.base_url)
+    assert adapter.max_retries.total == 5
+    assert 429 in adapter.max_retries.status_forcelist
+    assert "POST" in adapter.max_retries.allowed_methods
+    assert searcher.tool in searcher.session.headers["User-Agent"]
+
+
+def test_retries_take_a_rate_limiter_slot(monkeypatch):
+    searcher = pf.PubMedSearcher(api_key="secret")
+    waits = []
+    monkeypatch.setattr(searcher.rate_limiter, "wait", lambda: waits.append("eutils"))
+    monkeypatch.setattr(searcher.oa_rate_limiter, "wait", lambda: waits.append("oa"))
+
+    # urllib3 replaces the Retry on every attempt, so the limiter must carry over
+    for url in (searcher.base_url, searcher.oa_url):
+        retry = searcher.session.get_adapter(url).max_retries.increment(method="GET", url=url)
+        retry.sleep()
+    assert waits == ["eutils", "oa"]
+
+
+def _efetch_xml(pmids):
+    articles = "".join(
+        f"""<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID>
+              <Article><ArticleTitle>Title {pmid}</ArticleTitle></Article>
+            </MedlineCitation></PubmedArticle>"""
+        for pmid in pmids
+    )
+    return f"<PubmedArticleSet>{articles}</PubmedArticleSet>".encode()
+
+
+class _StreamedResponse:
+    # Minimal stand-in for a streamed requests.Response
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        return None
+
+    def iter_content(self, chunk_size=1):
+        # Deliberately small chunks so articles straddle feed() calls
+        for i in range(0, len(self.content), 97):
+            yield self.content[i:i + 97]
+
+
+class _FakeEfetch:
+    # Answers efetch POSTs locally and records what was asked for
+    def __init__(self):
+        self.posts = []
+        self.body = _efetch_xml  # Builds the response body from the requested PMIDs
+
+    @property
+    def requested(self):
+        return [pmid for data in self.posts for pmid in data["id"].split(",")]
+
+    def post(self, url, data=None, **kwargs):
+        self.posts.append(data)
+        return _StreamedResponse(self.body(data["id"].split(",")))
+
+
+@pytest.fixture
+def efetch():
+    return _FakeEfetch()
+
+
+@pytest.fixture
+def searcher(monkeypatch, efetch):
+    # Only this searcher is patched: no network, and its rate limiter never waits
+    searcher = pf.PubMedSearcher()
+    monkeypatch.setattr(searcher.session, "post", efetch.post)
+    monkeypatch.setattr(searcher.rate_limiter, "wait", lambda: None)
+    return searcher
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = pf.ArticleCache(str(tmp_path))
+    yield cache
+    cache.close()
+
+
+def test_fetch_article_details_keeps_batch_order(searcher):
+    # Batches are fetched concurrently but must come back in PMID order
+    pmids = [str(n) for n in range(1, 1201)]
+    articles = searcher.fetch_article_details(pmids)
+
+    assert [a.pmid for a in articles] == pmids
+    assert articles[0].title == "Title 1"
+    assert articles[-1].url == "https://pubmed.ncbi.nlm.nih.gov/1200/"
+
+
+SAMPLE_ARTICLE = b"""<PubmedArticleSet><PubmedArticle>
+  <MedlineCitation>
+    <PMID Version="1">38000001</PMID>
+    <Article>
+      <Journal>
+        <JournalIssue><PubDate><Year>2024</Year><Month>Mar</Month><Day>05</Day></PubDate></JournalIssue>
+        <Title>Gynecologic Oncology</Title>
+      </Journal>
+      <ArticleTitle>Outcomes in endometrial cancer.</ArticleTitle>
+      <Abstract>
+        <AbstractText Label="BACKGROUND">Background text.</AbstractText>
+        <AbstractText Label="RESULTS">Results text.</AbstractText>
+      </Abstract>
+      <AuthorList>
+        <Author><LastName>Smith</LastName><ForeName>Jane</ForeName></Author>
+        <Author><LastName>Lee</LastName></Author>
+        <Author><CollectiveName>Study Group</CollectiveName></Author>
+      </AuthorList>
+    </Article>
+    <OtherAbstract><AbstractText>Translated abstract.</AbstractText></OtherAbstract>
+    <MeshHeadingList>
+      <MeshHeading><DescriptorName>Endometrial Neoplasms</DescriptorName></MeshHeading>
+      <MeshHeading><DescriptorName>Humans</DescriptorName></MeshHeading>
+    </MeshHeadingList>
+    <CommentsCorrectionsList>
+      <CommentsCorrections><PMID>11111111</PMID></CommentsCorrections>
+    </CommentsCorrectionsList>
+  </MedlineCitation>
+  <PubmedData>
+    <ArticleIdList>
+      <ArticleId IdType="pubmed">38000001</ArticleId>
+      <ArticleId IdType="pmc">PMC1234567</ArticleId>
+      <ArticleId IdType="doi">10.1000/example</ArticleId>
+    </ArticleIdList>
+    <ReferenceList><Reference><ArticleIdList>
+      <ArticleId IdType="doi">10.1000/reference</ArticleId>
+    </ArticleIdList></Reference></ReferenceList>
+  </PubmedData>
+</PubmedArticle></PubmedArticleSet>"""
+
+
+def test_parse_article_extracts_fields():
+    root = pf._parse_xml(SAMPLE_ARTICLE)
+    article = pf.parse_article(root.find(".//PubmedArticle"))
+
+    assert article.pmid == "38000001"
+    assert article.title == "Outcomes in endometrial cancer."
+    assert article.authors == ["Smith, Jane", "Lee"]
+    assert article.authors_display == "Smith, Jane; Lee"
+    assert article.journal == "Gynecologic Oncology"
+    assert article.date == "2024-Mar-05"
+    assert article.abstract == "BACKGROUND: Background text. RESULTS: Results text."
+    assert article.mesh_terms == ["Endometrial Neoplasms", "Humans"]
+    assert article.doi == "10.1000/example"
+    assert article.pmc_id == "PMC1234567"
+    assert article.url == "https://pubmed.ncbi.nlm.nih.gov/38000001/"
+    assert pf.parse_articles(SAMPLE_ARTICLE, chunk_size=50) == [article]
+
+
+def test_parse_article_ignores_reference_ids():
+    # Without its own DOI, the article must not pick up a cited reference's
+    xml = SAMPLE_ARTICLE.replace(b'<ArticleId IdType="doi">10.1000/example</ArticleId>', b"")
+    [article] = pf.parse_articles(xml)
+
+    assert article.doi == ""
+    assert article.pmc_id == "PMC1234567"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_save_to_json_round_trips(tmp_path, monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(pf, "orjson", None)
+
+    articles = pf.parse_articles(_efetch_xml(["1", "2"]))
+    articles[0].title = "Café study"
+    out = tmp_path / "articles.json"
+    pf.PubMedSearcher().save_to_json(articles, ["Humans"], filename=str(out), days_back=7)
+
+    text = out.read_text(encoding="utf-8")
+    data = json.loads(text)
+    assert [pf.Article(**a) for a in data["articles"]] == articles
+    assert data["articles"][0]["title"] == "Café study"
+    assert data["search_info"]["total_articles"] == 2
+    assert data["search_info"]["mesh_terms"] == ["Humans"]
+    # Streamed output keeps the pretty-printed json.dump layout
+    assert text == json.dumps(data, indent=2, ensure_ascii=False)
+
+    pf.PubMedSearcher().save_to_json([], ["Humans"], filename=str(out))
+    text = out.read_text(encoding="utf-8")
+    assert text == json.dumps(json.loads(text), indent=2, ensure_ascii=False)
+
+
+def test_save_to_json_writes_json_lines(tmp_path):
+    articles = pf.parse_articles(_efetch_xml(["1", "2"]))
+    out = tmp_path / "articles.jsonl"
+    pf.PubMedSearcher().save_to_json(articles, "Humans", filename=str(out))
+
+    lines = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert lines[0]["search_info"]["total_articles"] == 2
+    assert [pf.Article(**a) for a in lines[1:]] == articles
+
+
+def test_fetch_article_details_reuses_cache(cache, searcher, efetch):
+    searcher.cache = cache
+    searcher.fetch_article_details(["1", "2"])
+    efetch.posts.clear()
+    articles = searcher.fetch_article_details(["3", "1", "2"])
+
+    # Only the uncached PMID goes over the wire; order follows the search
+    assert efetch.requested == ["3"]
+    assert [a.pmid for a in articles] == ["3", "1", "2"]
+    assert articles[1].title == "Title 1"
+
+
+def test_fetch_article_details_drops_truncated_batch(cache, searcher, efetch):
+    searcher.cache = cache
+    efetch.body = lambda pmids: SAMPLE_ARTICLE[:700]
+
+    # A body cut off mid-record fails the whole batch and caches nothing
+    assert searcher.fetch_article_details(["38000001"]) == []
+    assert searcher.cache.get_many("pubmed", ["38000001"]) == {}
+
+
+def test_fetch_article_details_refetches_bad_cache_rows(cache, searcher, efetch):
+    cache.set_many("pubmed", [("1", {"pmid": "1", "retired_field": "x"})])
+    with cache.conn:
+        cache.conn.execute("UPDATE cache SET value = '{not json' WHERE key = 'pubmed:1'")
+    cache.set_many("pubmed", [("2", {"pmid": "2", "retired_field": "x"})])
+
+    # Corrupt and stale-schema rows are cache misses, not crashes
+    articles = searcher.fetch_article_details(["1", "2"])
+    assert efetch.requested == ["1", "2"]
+    assert [a.title for a in articles] == ["Title 1", "Title 2"]
+
+
+def test_check_pmc_open_access_status_ignores_truncated_response(cache, monkeypatch, searcher):
+    searcher.cache = cache
+    monkeypatch.setattr(searcher.session, "get", lambda url, params=None, **kwargs: _StreamedResponse(
+        b'<OA><records><record id="PMC111" license="CC BY"/><rec'
+    ))
+    articles = pf.parse_articles(_efetch_xml(["1", "2"]))
+    articles[0].pmc_id, articles[1].pmc_id = "PMC111", "PMC222"
+    searcher.add_fulltext_info(articles)
+
+    # Neither the complete record nor the missing one is trusted or cached
+    assert [a.fulltext["access_type"] for a in articles] == ["unknown", "unknown"]
+    assert searcher.cache.get_many("pmc-oa", ["PMC111", "PMC222"]) == {}
+
+
+def test_rate_limiter_spaces_requests(monkeypatch):
+    slept = []
+    monkeypatch.setattr(pf.time, "monotonic", lambda: 100.0)
+    monkeypatch.setattr(pf.time, "sleep", slept.append)
+
+    limiter = pf.RateLimiter(rate=10)
+    for _ in range(3):
+        limiter.wait()
+
+    # First call goes straight through, the rest queue 0.1s apart
+    assert slept == pytest.approx([0.1, 0.2])
+
+
+def test_rate_limiter_shares_budget_across_workers(monkeypatch):
+    slept = []
+    monkeypatch.setattr(pf.time, "monotonic", lambda: 100.0)
+    monkeypatch.setattr(pf.time, "sleep", slept.append)
+
+    # Three concurrent workers still get one slot per 1/3s between them,
+    # rather than each pacing itself independently
+    limiter = pf.RateLimiter(rate=3)
+    with pf.ThreadPoolExecutor(max_workers=3) as executor:
+        list(executor.map(lambda _: limiter.wait(), range(9)))
+
+    assert sorted(slept) == pytest.approx([n / 3 for n in range(1, 9)])
+
+
+def test_api_key_raises_rate_and_is_sent(searcher, efetch):
+    assert pf.PubMedSearcher().rate_limiter.interval == pytest.approx(1 / 3)
+    keyed = pf.PubMedSearcher(api_key="secret")
+    assert keyed.rate_limiter.interval == pytest.approx(1 / 10)
+    # oa.fcgi isn't sent the key, so it keeps the keyless rate
+    assert keyed.oa_rate_limiter.interval == pytest.approx(1 / 3)
+
+    searcher.api_key = "secret"
+    searcher.fetch_article_details(["1"])
+    assert efetch.posts[0]["api_key"] == "secret"
+
+
+def test_parse_workers_match_in_process_parsing(searcher):
+    pmids = [str(n) for n in range(1, 601)]
+    in_process = searcher.fetch_article_details(pmids)
+
+    searcher.parse_workers = 2
+    assert searcher.fetch_article_details(pmids) == in_process
+
+
+def test_broken_parse_pool_falls_back_to_in_process(searcher):
+    class BrokenPool:
+        def submit(self, *args):
+            raise pf.BrokenProcessPool("worker died")
+
+    articles = searcher._fetch_batch(["1", "2"], 1, 1, parse_pool=BrokenPool())
+    assert [a.pmid for a in articles] == ["1", "2"]
+
+
+def test_load_config_reads_parse_workers(tmp_path):
+    config_file = tmp_path / "config.ini"
+    config_file.write_text("[search]\nparse_workers = 4\n")
+    assert pf.load_config(str(config_file))["parse_workers"] == 4
+
+    config_file.write_text("[search]\nparse_workers = -2\n")
+    with pytest.raises(ValueError):
+        pf.load_config(str(config_file))
+
+
+def test_parse_workers_rejects_negative(monkeypatch):
+    monkeypatch.setattr(pf.sys, "argv", ["prog", "--mesh-terms", "Humans", "--parse-workers", "-2"])
+    with pytest.raises(SystemExit):
+        pf.parse_arguments()
+
+
+def test_fetch_article_details_shares_repeated_strings(searcher, efetch):
+    efetch.body = lambda pmids: SAMPLE_ARTICLE.replace(b"38000001", pmids[0].encode())
+    first, = searcher.fetch_article_details(["1"])
+    second, = searcher.fetch_article_details(["2"])
+
+    assert second.journal == "Gynecologic Oncology"
+    assert second.journal is first.journal
+    assert all(a is b for a, b in zip(first.mesh_terms, second.mesh_terms))
+
+
+def test_save_to_json_reports_search_window(tmp_path, monkeypatch):
+    searcher = pf.PubMedSearcher()
+    monkeypatch.setattr(searcher.session, "get", lambda url, params=None, **kwargs: _StreamedResponse(
+        b"<eSearchResult><Count>0</Count><IdList></IdList></eSearchResult>"
+    ))
+    searcher.search_pubmed(mesh_terms=["Humans"], days_back=10)
+
+    out = tmp_path / "articles.json"
+    # The saved range comes from the search, not from days_back at save time
+    searcher.save_to_json([], ["Humans"], filename=str(out), days_back=99)
+    date_range = json.loads(out.read_text(encoding="utf-8"))["search_info"]["date_range"]
+    assert date_range == {
+        "start_date": searcher._search_start.strftime("%Y-%m-%d"),
+        "end_date": searcher._search_end.strftime("%Y-%m-%d"),
+    }
+    assert (searcher._search_end - searcher._search_start).days == 10
+
+
+def test_check_pmc_open_access_status_matches_records(monkeypatch):
+    captured = {}
+
+    def fake_get(url, params=None, **kwargs):
+        captured["ids"] = params["id"]
+        return _StreamedResponse(b"""<OA><records>
+            <record id="PMC111" license="CC BY"><link format="pdf" href="https://example.org/111.pdf"/></record>
+            <record id="222" license="CC0"/>
+        </records></OA>""")
+
+    searcher = pf.PubMedSearcher()
+    monkeypatch.setattr(searcher.session, "get", fake_get)
+    monkeypatch.setattr(searcher.oa_rate_limiter, "wait", lambda: None)
+    articles = pf.parse_articles(_efetch_xml(["1", "2", "3"]))
+    for article, pmc_id in zip(articles, ["PMC111", "222", "PMC333"]):
+        article.pmc_id = pmc_id
+    searcher.add_fulltext_info(articles)
+
+    assert captured["ids"] == "111,222,333"
+    assert [a.fulltext["access_type"] for a in articles] == ["open", "open", "closed"]
+    assert articles[0].fulltext["license"] == "CC BY"
+    assert articles[0].fulltext["download_links"] == [{"format": "pdf", "url": "https://example.org/111.pdf"}]
+    assert articles[1].fulltext["url"] == "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC222/"